@@ -17,7 +17,9 @@
 #
 
 
+import functools
 import getpass
+import itertools
 import os
 import platform
 import typing
@@ -47,6 +49,11 @@ class ClientConfiguration(typing.NamedTuple):
 
 
 _system = platform.uname().system
+_IS_WINDOWS = _system == 'Windows'
+_DEFAULT_UNIX_HOSTS = ('/run/edgedb', '/var/run/edgedb')
+_DSN_SCHEMES = frozenset({'edgedb', 'edgedbadmin'})
+_DSN_QUERY_KEYS = frozenset({
+    'port', 'host', 'dbname', 'database', 'user', 'password'})
 
 
 def _validate_port_spec(hosts, port):
@@ -55,15 +62,32 @@ def _validate_port_spec(hosts, port):
         # match that of the host list.
         if len(port) != len(hosts):
             raise errors.InterfaceError(
-                'could not match {} port numbers to {} hosts'.format(
-                    len(port), len(hosts)))
+                f'could not match {len(port)} port numbers to '
+                f'{len(hosts)} hosts')
     else:
         port = [port for _ in range(len(hosts))]
 
     return port
 
 
-def _parse_hostlist(hostlist, port):
+def _parse_default_port(portspec):
+    if portspec:
+        if ',' in portspec:
+            return list(map(int, portspec.split(',')))
+        else:
+            return int(portspec)
+    else:
+        return EDGEDB_PORT
+
+
+def _parse_hostlist(hostlist, port, env_port):
+    if ',' not in hostlist and ':' not in hostlist:
+        # Fast path for the common case of a single host without a port.
+        hosts = [hostlist]
+        if not port:
+            port = _parse_default_port(env_port)
+        return hosts, _validate_port_spec(hosts, port)
+
     if ',' in hostlist:
         # A comma-separated list of host addresses.
         hostspecs = hostlist.split(',')
@@ -74,16 +98,8 @@ def _parse_hostlist(hostlist, port):
     hostlist_ports = []
 
     if not port:
-        portspec = os.environ.get('EDGEDB_PORT')
-        if portspec:
-            if ',' in portspec:
-                default_port = [int(p) for p in portspec.split(',')]
-            else:
-                default_port = int(portspec)
-        else:
-            default_port = EDGEDB_PORT
-
-        default_port = _validate_port_spec(hostspecs, default_port)
+        default_port = _validate_port_spec(
+            hostspecs, _parse_default_port(env_port))
 
     else:
         port = _validate_port_spec(hostspecs, port)
@@ -104,6 +120,31 @@ def _parse_hostlist(hostlist, port):
     return hosts, port
 
 
+@functools.lru_cache(maxsize=None)
+def _default_user():
+    # The OS user does not change over the lifetime of the process.
+    return getpass.getuser()
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_dsn_cached(dsn):
+    # Connection pools parse the same DSN over and over again, so
+    # cache the environment-independent part of the work.  The result
+    # must be immutable, hence the query is returned as a tuple of
+    # (key, value) pairs rather than a dict.
+    parsed = urllib.parse.urlsplit(dsn)
+
+    query = ()
+    if parsed.query:
+        # When a key is repeated, the last value wins.
+        query = dict(
+            urllib.parse.parse_qsl(parsed.query, strict_parsing=True))
+        query = tuple(query.items())
+
+    return (parsed.scheme, parsed.netloc, parsed.path,
+            parsed.username, parsed.password, query)
+
+
 def _parse_connect_dsn_and_args(*, dsn, host, port, user,
                                 password, database, admin,
                                 connect_timeout, server_settings):
@@ -114,11 +155,14 @@ def _parse_connect_dsn_and_args(*, dsn, host, port, user,
             'Use command-line tool `edgedb` to setup proper credentials.',
             DeprecationWarning, 4)
 
+    env_port = os.environ.get('EDGEDB_PORT')
+
     if dsn and dsn.startswith(("edgedb://", "edgedbadmin://")):
-        parsed = urllib.parse.urlparse(dsn)
+        (scheme, netloc, path, dsn_user, dsn_password,
+         dsn_query) = _parse_dsn_cached(dsn)
 
-        if parsed.scheme not in ('edgedb', 'edgedbadmin'):
-            if parsed.scheme == 'edgedbadmin':
+        if scheme not in _DSN_SCHEMES:
+            if scheme == 'edgedbadmin':
                 warnings.warn(
                     'The `edgedbadmin` scheme is deprecated and is scheduled '
                     'to be removed. Admin socket should never be used in '
@@ -127,69 +171,65 @@ def _parse_connect_dsn_and_args(*, dsn, host, port, user,
                     DeprecationWarning, 4)
             raise ValueError(
                 f'invalid DSN: scheme is expected to be '
-                f'"edgedb" or "edgedbadmin", got {parsed.scheme!r}')
+                f'"edgedb" or "edgedbadmin", got {scheme!r}')
 
         if admin is None:
-            admin = parsed.scheme == 'edgedbadmin'
+            admin = scheme == 'edgedbadmin'
 
-        if not host and parsed.netloc:
-            if '@' in parsed.netloc:
-                auth, _, hostspec = parsed.netloc.partition('@')
-            else:
-                hostspec = parsed.netloc
+        if not host and netloc:
+            # Same as urlsplit(), which also takes everything after
+            # the last '@' as the host part.
+            _, _, hostspec = netloc.rpartition('@')
 
             if hostspec:
-                host, port = _parse_hostlist(hostspec, port)
-
-        if parsed.path and database is None:
-            database = parsed.path
-            if database.startswith('/'):
-                database = database[1:]
-
-        if parsed.username and user is None:
-            user = parsed.username
-
-        if parsed.password and password is None:
-            password = parsed.password
-
-        if parsed.query:
-            query = urllib.parse.parse_qs(parsed.query, strict_parsing=True)
-            for key, val in query.items():
-                if isinstance(val, list):
-                    query[key] = val[-1]
-
-            if 'port' in query:
-                val = query.pop('port')
-                if not port and val:
-                    port = [int(p) for p in val.split(',')]
-
-            if 'host' in query:
-                val = query.pop('host')
-                if not host and val:
-                    host, port = _parse_hostlist(val, port)
-
-            if 'dbname' in query:
-                val = query.pop('dbname')
-                if database is None:
-                    database = val
-
-            if 'database' in query:
-                val = query.pop('database')
-                if database is None:
-                    database = val
-
-            if 'user' in query:
-                val = query.pop('user')
-                if user is None:
-                    user = val
-
-            if 'password' in query:
-                val = query.pop('password')
-                if password is None:
-                    password = val
+                host, port = _parse_hostlist(hostspec, port, env_port)
+
+        if path and database is None:
+            # The path always starts with a slash when there is a netloc
+            # part, which the "edgedb://" prefix guarantees.
+            database = path[1:]
+
+        if dsn_user and user is None:
+            user = dsn_user
+
+        if dsn_password and password is None:
+            password = dsn_password
+
+        if dsn_query:
+            # Split connection options from server settings in a single
+            # pass.  The options are then applied in a fixed order, since
+            # "host" parsing depends on a "port" given in the query.
+            query = {}
+            opts = {}
+            for key, val in dsn_query:
+                if key in _DSN_QUERY_KEYS:
+                    opts[key] = val
+                else:
+                    query[key] = val
+
+            val = opts.get('port')
+            if not port and val:
+                port = list(map(int, val.split(',')))
+
+            val = opts.get('host')
+            if not host and val:
+                host, port = _parse_hostlist(val, port, env_port)
+
+            if database is None:
+                database = opts.get('dbname') or opts.get('database')
+
+            if user is None:
+                user = opts.get('user')
+
+            if password is None:
+                password = opts.get('password')
 
             if query:
-                if server_settings is None:
+                # `query` is a fresh dict, so it can be used as is
+                # when there is nothing to merge it with.
+                if server_settings is None or (
+                        isinstance(server_settings, dict) and
+                        not server_settings):
                     server_settings = query
                 else:
                     server_settings = {**query, **server_settings}
@@ -222,13 +262,13 @@ def _parse_connect_dsn_and_args(*, dsn, host, port, user,
     if not host:
         hostspec = os.environ.get('EDGEDB_HOST')
         if hostspec:
-            host, port = _parse_hostlist(hostspec, port)
+            host, port = _parse_hostlist(hostspec, port, env_port)
 
     if not host:
-        if _system == 'Windows':
+        if _IS_WINDOWS:
             host = []
         else:
-            host = ['/run/edgedb', '/var/run/edgedb']
+            host = list(_DEFAULT_UNIX_HOSTS)
 
         if not admin:
             host.append('localhost')
@@ -237,27 +277,25 @@ def _parse_connect_dsn_and_args(*, dsn, host, port, user,
         host = [host]
 
     if not port:
-        portspec = os.environ.get('EDGEDB_PORT')
-        if portspec:
-            if ',' in portspec:
-                port = [int(p) for p in portspec.split(',')]
-            else:
-                port = int(portspec)
-        else:
-            port = EDGEDB_PORT
+        port = _parse_default_port(env_port)
 
     elif isinstance(port, (list, tuple)):
-        port = [int(p) for p in port]
+        port = list(map(int, port))
 
     else:
         port = int(port)
 
-    port = _validate_port_spec(host, port)
+    if isinstance(port, list):
+        port = _validate_port_spec(host, port)
+    else:
+        # All hosts share the same port, which is only ever zipped
+        # with the host list below, so don't build a list of copies.
+        port = itertools.repeat(port)
 
     if user is None:
         user = os.getenv('EDGEDB_USER')
         if not user:
-            user = getpass.getuser()
+            user = _default_user()
 
     if password is None:
         password = os.getenv('EDGEDB_PASSWORD')
@@ -279,7 +317,7 @@ def _parse_connect_dsn_and_args(*, dsn, host, port, user,
     have_unix_sockets = False
     addrs = []
     for h, p in zip(host, port):
-        if h.startswith('/'):
+        if h[:1] == '/':
             # UNIX socket name
             if '.s.EDGEDB.' not in h:
                 if admin:
@@ -303,8 +341,8 @@ def _parse_connect_dsn_and_args(*, dsn, host, port, user,
 
     if server_settings is not None and (
             not isinstance(server_settings, dict) or
-            not all(isinstance(k, str) for k in server_settings) or
-            not all(isinstance(v, str) for v in server_settings.values())):
+            not all(isinstance(k, str) and isinstance(v, str)
+                    for k, v in server_settings.items())):
         raise ValueError(
             'server_settings is expected to be None or '
             'a Dict[str, str]')
@@ -319,22 +357,38 @@ def _parse_connect_dsn_and_args(*, dsn, host, port, user,
     return addrs, params
 
 
+def _validate_command_timeout(command_timeout):
+    try:
+        if isinstance(command_timeout, bool):
+            raise ValueError
+        command_timeout = float(command_timeout)
+        if command_timeout <= 0:
+            raise ValueError
+    except (ValueError, TypeError):
+        raise ValueError(
+            'invalid command_timeout value: '
+            f'expected greater than 0 float (got {command_timeout!r})'
+        ) from None
+
+    return command_timeout
+
+
+# Only used for plain ints and floats, which are always hashable
+# and are what pools normally pass on every connect.
+_validate_number_command_timeout = functools.lru_cache(maxsize=32)(
+    _validate_command_timeout)
+
+
 def parse_connect_arguments(*, dsn, host, port, user, password,
                             database, admin, timeout, command_timeout,
                             server_settings):
 
     if command_timeout is not None:
-        try:
-            if isinstance(command_timeout, bool):
-                raise ValueError
-            command_timeout = float(command_timeout)
-            if command_timeout <= 0:
-                raise ValueError
-        except ValueError:
-            raise ValueError(
-                'invalid command_timeout value: '
-                'expected greater than 0 float (got {!r})'.format(
-                    command_timeout)) from None
+        if type(command_timeout) in (int, float):
+            command_timeout = _validate_number_command_timeout(
+                command_timeout)
+        else:
+            command_timeout = _validate_command_timeout(command_timeout)
 
     addrs, params = _parse_connect_dsn_and_args(
         dsn=dsn, host=host, port=port, user=user,